@@ -1,8 +1,19 @@
 """Locking mechanisms are implemented here."""
 
+from __future__ import annotations
+
 import importlib
+import os
+import threading
 from abc import ABC, abstractmethod
 from types import TracebackType
+from typing import Any
+
+BACKENDS: dict[str, type[AbstractBaseLock]] = {}
+"""Map the module name of each concrete backend to its `AbstractBaseLock` subclass."""
+
+_LOCKS: dict[tuple[str, int, int], AbstractBaseLock] = {}
+"""The most recent instance of each backend created by `get_lock()`, by backend name, process ID, and thread ID."""
 
 
 class AbstractBaseLock(ABC):
@@ -11,7 +22,17 @@ class AbstractBaseLock(ABC):
     This API is modeled after the built-in `threading.Lock` class.
     """
 
-    @abstractmethod
+    __slots__ = ('_depth',)
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Register the subclass in `BACKENDS` under the name of the module that defines it."""
+        super().__init_subclass__(**kwargs)
+        BACKENDS[cls.__module__.rsplit('.', 1)[-1]] = cls
+
+    def __init__(self) -> None:
+        """Start with the lock released."""
+        self._depth = 0
+
     def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
         """Acquire a lock, blocking or non-blocking.
 
@@ -28,15 +49,32 @@ class AbstractBaseLock(ABC):
         The return value is `True` if the lock is acquired successfully, `False` if not (for example if the timeout
         expired).
 
+        Locks are reentrant, like `threading.RLock`: if this instance already holds the lock, increment the recursion
+        level and return `True` immediately. The lock is only unlocked once `release()` has been called as many times
+        as `acquire()` succeeded.
+
         Reference: https://docs.python.org/3/library/threading.html#threading.Lock
         """
+        if self._depth > 0:
+            self._depth += 1
+            return True
+
+        if not self._acquire(blocking, timeout):
+            return False
+
+        self._depth = 1
+        return True
 
     @abstractmethod
+    def _acquire(self, blocking: bool, timeout: float) -> bool:
+        """Acquire the underlying lock, which this instance does not hold; the arguments are those of `acquire()`."""
+
     def release(self) -> None:
         """Release a lock. This can be called from any thread, not only the thread which has acquired the lock.
 
-        When the lock is locked, reset it to unlocked, and return. If any other threads are blocked waiting for the lock
-        to become unlocked, allow exactly one of them to proceed.
+        When the lock is locked, decrement the recursion level; if it reaches zero, reset the lock to unlocked, and
+        return. If any other threads are blocked waiting for the lock to become unlocked, allow exactly one of them to
+        proceed.
 
         When invoked on an unlocked lock, a RuntimeError is raised.
 
@@ -44,32 +82,59 @@ class AbstractBaseLock(ABC):
 
         Reference: https://docs.python.org/3/library/threading.html#threading.Lock
         """
+        if self._depth == 0:
+            raise RuntimeError('release unlocked lock')
+
+        self._depth -= 1
+        if self._depth == 0:
+            self._release()
 
     @abstractmethod
+    def _release(self) -> None:
+        """Release the underlying lock once the outermost `acquire()` has been matched by `release()`."""
+
     def locked(self) -> bool:
         """Return `True` if the lock is acquired."""
+        return self._depth > 0
 
-    @abstractmethod
     def __enter__(self) -> bool:
         """Acquire the lock when entering a `with` statement context."""
+        return self.acquire()
 
-    @abstractmethod
     def __exit__(
         self, exc_type: type[BaseException] | None, value: BaseException | None, traceback: TracebackType | None
-    ) -> None:
+    ) -> bool | None:
         """Release the lock when exiting the context."""
+        self.release()
+        return None
 
 
 def get_backend(name: str) -> type[AbstractBaseLock]:
-    """Import the `locked_migrations.backends.Backend` subclass for the given module name."""
-    module = importlib.import_module(f'locked_migrations.backends.{name}')
-    for val in module.__dict__.values():
+    """Look up the registered `locked_migrations.backends.AbstractBaseLock` subclass for the given module name."""
+    if name not in BACKENDS:
+        # backends register themselves in `BACKENDS` when their module is first imported
+        module = f'locked_migrations.backends.{name}'
         try:
-            is_subclass = issubclass(val, AbstractBaseLock)
-        except TypeError:
-            continue
+            importlib.import_module(module)
+        except ModuleNotFoundError as exc:
+            if exc.name != module:
+                raise
+
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f'No backend found for {name}') from None
 
-        if is_subclass and val is not AbstractBaseLock:
-            return val  # type: ignore[no-any-return]  # the conditional ensures this is a type[AbstractBaseLock]
 
-    raise ValueError(f'No backend found for {name}')  # pragma: no cover
+def get_lock(name: str) -> AbstractBaseLock:
+    """Return an instance of the named backend, reusing the one held by the current thread if there is one.
+
+    A nested `migrate` command (e.g. `call_command('migrate')` from a `post_migrate` handler) therefore reenters the
+    lock held by the outer command rather than waiting for it. Instances are never shared between threads or with a
+    forked child process, and a new instance (reading the current settings) is created once the lock is released.
+    """
+    key = (name, os.getpid(), threading.get_ident())
+    lock = _LOCKS.get(key)
+    if lock is None or not lock.locked():
+        lock = _LOCKS[key] = get_backend(name)()
+    return lock
@@ -3,47 +3,206 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
+import math
+import os
+import sys
+import time
+import weakref
+from pathlib import Path
 
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from filelock import FileLock as BaseFileLock
+from filelock import SoftFileLock, Timeout
 
 from locked_migrations.backends import AbstractBaseLock
 
+if sys.platform == 'linux':
+    import fcntl
+
+    try:
+        import inotify_simple
+    except ImportError:  # pragma: no cover
+        inotify_simple = None
+else:  # pragma: no cover  # `inotify` is Linux-only
+    inotify_simple = None
+
 logger = logging.getLogger(__name__)
 
+MODES: dict[str, type[BaseFileLock] | type[SoftFileLock]] = {'hard': BaseFileLock, 'soft': SoftFileLock}
+"""Map each valid `LOCKED_MIGRATIONS_FILELOCK_MODE` to the `filelock` class that implements it."""
+
+WATCH_TIMEOUT = 1.0
+"""The maximum number of seconds to wait for an `inotify` event before retrying (in case an event is missed)."""
+
+
+def _probe_soft(lockfile: Path) -> bool:
+    """Return `False` if the lockfile exists (i.e. another process holds a `filelock.SoftFileLock`)."""
+    return not lockfile.exists()
+
+
+def _probe(lockfile: Path) -> bool:
+    """Return `False` if the lockfile is currently locked by another process.
+
+    The lockfile is opened read-only: closing it does not emit an `IN_CLOSE_WRITE` event, which would wake the other
+    waiters.
+    """
+    try:
+        fd = os.open(lockfile, os.O_RDONLY)
+    except FileNotFoundError:
+        return True
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    except OSError:  # the filesystem does not support `flock()`; let `filelock` decide
+        return True
+    finally:
+        os.close(fd)
+
+    return True
+
+
+def _wait_for_event(inotify: inotify_simple.INotify, name: str, until: float) -> None:
+    """Block until an event for the named file is read (or the event queue overflows), or until `until` passes.
+
+    Events for the other files in the watched directory (e.g. an SQLite journal) are discarded.
+    """
+    while (remaining := until - time.monotonic()) > 0:
+        events = inotify.read(timeout=math.ceil(remaining * 1000))
+        if any(event.name == name or event.mask & inotify_simple.flags.Q_OVERFLOW for event in events):
+            return
+
 
 class FileLock(AbstractBaseLock):
     """A file-based locking backend (not for use in production).
 
     WARNING: This backend is not effective for distributed systems because it relies on the local filesystem of a single
     host.
+
+    Set `LOCKED_MIGRATIONS_FILELOCK_MODE = 'soft'` to use `filelock.SoftFileLock`, which treats the existence of the
+    lockfile as the lock (created atomically with `O_EXCL`) instead of calling `flock()`; this is preferable on network
+    filesystems that do not honor `flock()`.
+
+    On Linux, when `inotify_simple` is installed, blocking waits sleep until the lockfile is closed or deleted rather
+    than polling every `LOCKED_MIGRATIONS_POLL_INTERVAL` seconds.
     """
 
+    __slots__ = ('__weakref__', '_backend', '_lock', '_path', '_poll')  # `__weakref__` for `_INSTANCES`
+
     def __init__(self) -> None:
         """Use a containment strategy to wrap the `filelock.FileLock` class."""
-        lockfile = getattr(settings, 'LOCKED_MIGRATIONS_LOCKFILE', 'migrations.lock')
-        self._lock = BaseFileLock(lockfile, blocking=True)
+        super().__init__()
+        self._path = getattr(settings, 'LOCKED_MIGRATIONS_LOCKFILE', 'migrations.lock')
+        mode = getattr(settings, 'LOCKED_MIGRATIONS_FILELOCK_MODE', 'hard')
+        try:
+            self._backend = MODES[mode]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"LOCKED_MIGRATIONS_FILELOCK_MODE must be 'hard' or 'soft', not {mode!r}"
+            ) from None
+        self._lock = self._backend(self._path, blocking=True)
+        self._poll = getattr(settings, 'LOCKED_MIGRATIONS_POLL_INTERVAL', 0.005)
+        _INSTANCES.add(self)
+
+    def _reset_after_fork(self) -> None:
+        """Replace the lock inherited by a forked child process so that the child contends for the lockfile itself.
+
+        An inherited descriptor shares its `flock()` lock with the parent process, so it is closed without unlocking:
+        releasing it would release the parent's lock (or, for a soft lock, delete the parent's lockfile).
+        """
+        context = self._lock._context  # pylint: disable=protected-access
+        if context.lock_file_fd is not None:  # newer versions of `filelock` already reset the lock in the child
+            os.close(context.lock_file_fd)
+            context.lock_file_fd = None
+            context.lock_counter = 0
+
+        self._lock = self._backend(self._path, blocking=True)
+        self._depth = 0
+
+    def _acquire(self, blocking: bool, timeout: float) -> bool:
+        """Wait for the underlying `filelock.FileLock`."""
+        if blocking and timeout != 0 and (inotify := self._watch()) is not None:
+            with inotify:
+                return self._acquire_watched(inotify, timeout)
+
+        try:
+            self._lock.acquire(blocking=blocking, timeout=timeout, poll_interval=self._poll)
+        except Timeout:
+            return False
 
-    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
-        """Acquire the lock, blocking or non-blocking."""
-        return self._lock.acquire(blocking=blocking, timeout=timeout).lock.is_locked
+        return self._lock.is_locked
 
-    def release(self) -> None:
-        """Release the lock."""
-        self._lock.release()
+    def _watch(self) -> inotify_simple.INotify | None:
+        """Watch the lockfile's directory, or return `None` to fall back to polling if `inotify` is unavailable.
 
-    def locked(self) -> bool:
-        """Return `True` if the lock is acquired."""
-        return self._lock.is_locked
+        The directory is created first (as `filelock` would when acquiring the lock), since it cannot be watched
+        otherwise.
+        """
+        if inotify_simple is None:
+            return None
+
+        directory = Path(self._lock.lock_file).parent
+        directory.mkdir(parents=True, exist_ok=True)
+
+        try:
+            inotify = inotify_simple.INotify()
+        except OSError as exc:  # e.g. `EMFILE` once `fs.inotify.max_user_instances` is reached
+            logger.debug('polling for the lockfile: %s', exc)
+            return None
+
+        try:
+            inotify.add_watch(directory, inotify_simple.flags.CLOSE_WRITE | inotify_simple.flags.DELETE)
+        except OSError as exc:  # e.g. `ENOSPC` once `fs.inotify.max_user_watches` is reached
+            inotify.close()
+            logger.debug('polling for the lockfile: %s', exc)
+            return None
+
+        return inotify
+
+    def _acquire_watched(self, inotify: inotify_simple.INotify, timeout: float) -> bool:
+        """Retry the lock whenever `inotify` reports that the lockfile was closed after writing or deleted.
+
+        The watch is set up before the first attempt, so a release between the attempt and the wait is not missed.
+        """
+        lockfile = Path(self._lock.lock_file)
+        probe = _probe_soft if self._backend is SoftFileLock else _probe
+        deadline = math.inf if timeout < 0 else time.monotonic() + timeout
 
-    def __enter__(self) -> bool:
-        """Acquire the lock when entering a `with` statement context."""
-        return self._lock.acquire().lock.is_locked
+        while True:
+            if probe(lockfile) and self._try_acquire():
+                return True
 
-    def __exit__(self, exc_type: type[BaseException] | None, value: BaseException | None, traceback: Any) -> None:
-        """Release the lock when exiting the context."""
+            now = time.monotonic()
+            if now >= deadline:
+                return False
+
+            _wait_for_event(inotify, lockfile.name, min(now + WATCH_TIMEOUT, deadline))
+
+    def _try_acquire(self) -> bool:
+        """Make a single non-blocking attempt to acquire the lock."""
+        try:
+            self._lock.acquire(blocking=False)
+        except Timeout:
+            return False
+
+        return self._lock.is_locked
+
+    def _release(self) -> None:
+        """Release the underlying `filelock.FileLock`."""
         self._lock.release()
 
 
-logger.debug('successfully imported %s', __name__)
+_INSTANCES: weakref.WeakSet[FileLock] = weakref.WeakSet()
+"""The live `FileLock` instances, reset in forked child processes by a single hook."""
+
+
+def _reset_instances_after_fork() -> None:
+    """Reset every live `FileLock` instance in a forked child process."""
+    for instance in list(_INSTANCES):
+        instance._reset_after_fork()  # pylint: disable=protected-access
+
+
+if hasattr(os, 'register_at_fork'):  # not available on Windows
+    os.register_at_fork(after_in_child=_reset_instances_after_fork)
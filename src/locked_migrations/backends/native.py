@@ -0,0 +1,160 @@
+"""Define a locking backend that uses the operating system's native file locks (without a polling loop)."""
+
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from types import FrameType
+
+from django.conf import settings
+
+from locked_migrations.backends import AbstractBaseLock
+
+if sys.platform == 'win32':  # pragma: no cover
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+
+class _AlarmTimeout(Exception):  # noqa: N818  # private signal, never surfaced to the caller
+    """Raised from the `SIGALRM` handler to interrupt a blocking `flock()` call."""
+
+
+def _raise_alarm_timeout(signum: int, frame: FrameType | None) -> None:
+    """Handle `SIGALRM` by interrupting the blocked system call."""
+    raise _AlarmTimeout
+
+
+if sys.platform == 'win32':  # pragma: no cover
+
+    def _try_lock(fd: int) -> bool:
+        """Lock the first byte of the file without blocking; return `False` if it is locked by another process."""
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fd: int) -> None:
+        """Unlock the first byte of the file."""
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+
+    def _try_lock(fd: int) -> bool:
+        """Place an exclusive lock on the file without blocking; return `False` if it is locked by another process."""
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _unlock(fd: int) -> None:
+        """Remove the lock from the file."""
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class NativeLock(AbstractBaseLock):
+    """A file-based locking backend that blocks in the kernel until the lock is released.
+
+    On POSIX systems, waiters block in `flock()` and are woken by the kernel as soon as the lock is released. A bounded
+    wait in the main thread is interrupted with `SIGALRM` (replacing any `ITIMER_REAL` timer for its duration); other
+    threads, and all waits on Windows, fall back to polling every `LOCKED_MIGRATIONS_POLL_INTERVAL` seconds.
+
+    WARNING: Like `locked_migrations.backends.file.FileLock`, this backend relies on the filesystem of a single host.
+    """
+
+    __slots__ = ('_fd', '_path', '_poll')
+
+    def __init__(self) -> None:
+        """Read the path to the lockfile from the `LOCKED_MIGRATIONS_LOCKFILE` setting."""
+        super().__init__()
+        self._path = getattr(settings, 'LOCKED_MIGRATIONS_LOCKFILE', 'migrations.lock')
+        self._poll = getattr(settings, 'LOCKED_MIGRATIONS_POLL_INTERVAL', 0.005)
+        self._fd: int | None = None
+
+    def _acquire(self, blocking: bool, timeout: float) -> bool:
+        """Open the lockfile (creating its directory if needed) and lock it, keeping the descriptor open while held."""
+        Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._path, os.O_CREAT | os.O_RDWR, 0o644)
+
+        try:
+            acquired = self._lock(fd, blocking, timeout)
+        except _AlarmTimeout:  # the alarm fired after `flock()` returned, while the timer was being disarmed
+            acquired = False
+        except BaseException:
+            os.close(fd)
+            raise
+
+        if not acquired:
+            os.close(fd)
+            return False
+
+        self._fd = fd
+        return True
+
+    def _lock(self, fd: int, blocking: bool, timeout: float) -> bool:
+        """Lock the opened file, choosing the wait strategy for the platform, thread, and timeout."""
+        if not blocking or timeout == 0:
+            return _try_lock(fd)
+
+        if sys.platform == 'win32':  # pragma: no cover
+            return self._poll_lock(fd, timeout)
+
+        if timeout < 0:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            return True
+
+        if threading.current_thread() is threading.main_thread():
+            return self._alarm_lock(fd, timeout)
+
+        return self._poll_lock(fd, timeout)
+
+    @staticmethod
+    def _alarm_lock(fd: int, timeout: float) -> bool:
+        """Block in `flock()` until the lock is acquired or `SIGALRM` fires after `timeout` seconds."""
+        previous = signal.signal(signal.SIGALRM, _raise_alarm_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except _AlarmTimeout:
+            return False
+        finally:
+            try:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+            finally:
+                # `signal.signal()` returns `None` for a handler that was not installed from Python
+                signal.signal(signal.SIGALRM, signal.SIG_DFL if previous is None else previous)
+
+        return True
+
+    def _poll_lock(self, fd: int, timeout: float) -> bool:
+        """Retry a non-blocking lock until it succeeds or `timeout` seconds elapse (a negative value waits forever)."""
+        deadline = None if timeout < 0 else time.monotonic() + timeout
+
+        while not _try_lock(fd):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(self._poll)
+
+        return True
+
+    def _release(self) -> None:
+        """Unlock and close the lockfile."""
+        fd, self._fd = self._fd, None
+        if fd is None:  # pragma: no cover  # `release()` only calls this while the lock is held
+            return
+
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
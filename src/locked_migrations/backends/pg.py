@@ -0,0 +1,110 @@
+"""Define a locking backend based on PostgreSQL advisory locks."""
+
+from __future__ import annotations
+
+import functools
+import logging
+import math
+import zlib
+
+from django.conf import settings
+from django.db import NotSupportedError, connection, transaction
+from django.db.utils import DatabaseError, OperationalError
+
+from locked_migrations.backends import AbstractBaseLock
+
+logger = logging.getLogger(__name__)
+
+LOCK_NOT_AVAILABLE = '55P03'
+"""The SQLSTATE raised when `lock_timeout` expires (or a `NOWAIT` lock cannot be taken)."""
+
+NAMESPACE = b'locked_migrations'
+"""Hashed into the high half of the advisory lock key to avoid collisions with other users of advisory locks."""
+
+
+def _to_int4(value: int) -> int:
+    """Reinterpret the given unsigned 32-bit integer as a signed `int4`."""
+    return value - (1 << 32) if value >= (1 << 31) else value
+
+
+def _split64(value: int) -> tuple[int, int]:
+    """Split an unsigned 64-bit integer into the pair of signed `int4` values accepted by `pg_advisory_lock()`."""
+    return _to_int4(value >> 32), _to_int4(value & 0xFFFFFFFF)
+
+
+def lock_not_available(error: DatabaseError) -> bool:
+    """Return `True` if the error was raised because a lock could not be acquired (rather than e.g. a lost connection).
+
+    The SQLSTATE is read from the driver's exception: `sqlstate` for `psycopg` 3, or `pgcode` for `psycopg2`.
+    """
+    cause = error.__cause__
+    return (getattr(cause, 'sqlstate', None) or getattr(cause, 'pgcode', None)) == LOCK_NOT_AVAILABLE
+
+
+def lock_timeout_sql(timeout: float) -> str:
+    """Return a `SET LOCAL lock_timeout` statement for the given number of seconds (rounded up to 1 ms).
+
+    A negative timeout disables `lock_timeout`, overriding any value set for the server, database, or role.
+    """
+    if timeout < 0:
+        return 'SET LOCAL lock_timeout = 0'
+    return f"SET LOCAL lock_timeout = '{max(1, math.ceil(timeout * 1000))}ms'"
+
+
+@functools.cache
+def lock_key() -> tuple[int, int]:
+    """Derive the advisory lock key from the `LOCKED_MIGRATIONS_LOCK_KEY` setting (computed once, on first use)."""
+    name = getattr(settings, 'LOCKED_MIGRATIONS_LOCK_KEY', 'locked_migrations')
+    return _split64(zlib.crc32(NAMESPACE) << 32 | zlib.crc32(name.encode()))
+
+
+class PgAdvisoryLock(AbstractBaseLock):
+    """A locking backend that uses a session-level PostgreSQL advisory lock on the default database connection.
+
+    Advisory locks are held by the database server, so this backend is effective across hosts without relying on a
+    shared filesystem.
+
+    The lock is taken on Django's default connection, which `migrate` uses anyway, so no additional connection is
+    opened; connection reuse is configured as usual (`CONN_MAX_AGE`, or `OPTIONS['pool']` with `psycopg` 3). Note that
+    closing a pooled connection while the lock is held returns it to the pool with the session-level lock still held.
+
+    Reference: https://www.postgresql.org/docs/current/explicit-locking.html#ADVISORY-LOCKS
+    """
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        """Check that the default database is PostgreSQL."""
+        super().__init__()
+
+        if connection.vendor != 'postgresql':
+            raise NotSupportedError(f'{connection.display_name} does not support advisory locks')
+
+    def _acquire(self, blocking: bool, timeout: float) -> bool:
+        """Take the advisory lock on the database server."""
+        with connection.cursor() as cursor:
+            if not blocking or timeout == 0:
+                cursor.execute('SELECT pg_try_advisory_lock(%s, %s)', lock_key())
+                return bool(cursor.fetchone()[0])
+
+            try:
+                # `SET LOCAL` only applies within a transaction; the session-level lock outlives the transaction
+                with transaction.atomic():
+                    cursor.execute(lock_timeout_sql(timeout))
+                    cursor.execute('SELECT pg_advisory_lock(%s, %s)', lock_key())
+            except OperationalError as exc:
+                if not lock_not_available(exc):
+                    raise
+                logger.debug('timed out after %s seconds waiting for the advisory lock', timeout)
+                return False
+
+        return True
+
+    def _release(self) -> None:
+        """Release the advisory lock on the database server."""
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_unlock(%s, %s)', lock_key())
+            released = bool(cursor.fetchone()[0])
+
+        if not released:
+            raise RuntimeError('the advisory lock was not held by this session')
@@ -0,0 +1,109 @@
+"""Define a locking backend based on a `SELECT ... FOR UPDATE` row lock."""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, NotSupportedError, connections
+from django.db.backends.utils import CursorWrapper
+
+from locked_migrations.backends import AbstractBaseLock
+from locked_migrations.backends.pg import lock_not_available, lock_timeout_sql
+from locked_migrations.models import SENTINEL_PK, MigrationLock
+
+logger = logging.getLogger(__name__)
+
+MYSQL_LOCK_NOT_AVAILABLE = frozenset({1205, 3572})
+"""The MySQL / MariaDB error codes for an expired lock wait (`ER_LOCK_WAIT_TIMEOUT`) and a `NOWAIT` conflict."""
+
+MYSQL_MAX_LOCK_WAIT_TIMEOUT = 1073741824
+"""The maximum value of `innodb_lock_wait_timeout`, in seconds (about 34 years), used for an unbounded wait."""
+
+
+class RowLock(AbstractBaseLock):
+    """A locking backend that holds a row lock on the `locked_migrations.models.MigrationLock` sentinel row.
+
+    The row lock is held in a transaction on a dedicated connection to the default database, so it is not affected by
+    the (possibly non-atomic) transactions in which the migrations are applied. The sentinel row is created by a
+    migration: apply the `locked_migrations` migrations once (e.g. with another backend) before using this one.
+
+    Timed waits are supported on PostgreSQL and MySQL / MariaDB.
+    """
+
+    __slots__ = ('_connection',)
+
+    def __init__(self) -> None:
+        """Create (but do not yet open) the dedicated database connection."""
+        super().__init__()
+        self._connection = connections.create_connection(DEFAULT_DB_ALIAS)
+
+        if not self._connection.features.has_select_for_update:
+            raise NotSupportedError(f'{self._connection.display_name} does not support SELECT ... FOR UPDATE')
+
+    def _acquire(self, blocking: bool, timeout: float) -> bool:
+        """Lock the sentinel row in a new transaction, which stays open until the lock is released."""
+        try:
+            row = self._select_sentinel(not blocking or timeout == 0, timeout)
+        except DatabaseError as exc:
+            self._connection.close()  # closing the connection also ends the transaction
+            if not self._lock_not_available(exc):
+                raise
+            logger.debug('the sentinel row is locked by another connection')
+            return False
+        except BaseException:
+            self._connection.close()
+            raise
+
+        if row is None:
+            self._release()
+            raise ImproperlyConfigured('The sentinel row is missing; apply the `locked_migrations` migrations first')
+
+        return True
+
+    def _select_sentinel(self, nowait: bool, timeout: float) -> Any:
+        """Begin a transaction on the dedicated connection and select the sentinel row `FOR UPDATE` within it."""
+        if nowait and not self._connection.features.has_select_for_update_nowait:
+            raise NotSupportedError(f'{self._connection.display_name} does not support SELECT ... FOR UPDATE NOWAIT')
+
+        ops = self._connection.ops
+        table = ops.quote_name(MigrationLock._meta.db_table)
+        sql = f'SELECT id FROM {table} WHERE id = %s {ops.for_update_sql(nowait=nowait)}'  # noqa: S608
+
+        self._connection.set_autocommit(False)
+        with self._connection.cursor() as cursor:
+            if not nowait:
+                self._set_lock_timeout(cursor, timeout)
+            cursor.execute(sql, [SENTINEL_PK])
+            return cursor.fetchone()
+
+    def _set_lock_timeout(self, cursor: CursorWrapper, timeout: float) -> None:
+        """Limit the time that the current transaction waits for the row lock (a negative value waits forever).
+
+        The timeout is always set, so that a negative value overrides the server's default (e.g. 50 seconds for
+        `innodb_lock_wait_timeout`).
+        """
+        vendor = self._connection.vendor
+        if vendor == 'postgresql':
+            cursor.execute(lock_timeout_sql(timeout))
+        elif vendor == 'mysql':
+            seconds = MYSQL_MAX_LOCK_WAIT_TIMEOUT if timeout < 0 else max(1, math.ceil(timeout))
+            cursor.execute(f'SET SESSION innodb_lock_wait_timeout = {seconds}')
+        else:
+            raise NotSupportedError(f'{self._connection.display_name} does not support a lock timeout')
+
+    def _lock_not_available(self, error: DatabaseError) -> bool:
+        """Return `True` if the error was raised because the row lock could not be acquired (e.g. the timeout expired)."""
+        if self._connection.vendor == 'mysql':
+            args = getattr(error.__cause__, 'args', ())
+            return bool(args and args[0] in MYSQL_LOCK_NOT_AVAILABLE)
+        return lock_not_available(error)
+
+    def _release(self) -> None:
+        """End the transaction (releasing the row lock) and close the dedicated connection."""
+        try:
+            self._connection.rollback()
+        finally:
+            self._connection.close()
@@ -2,31 +2,23 @@
 
 from __future__ import annotations
 
-import argparse
 import logging
-from collections.abc import Sequence
+import time
 from typing import Any
 
-from django.core.management.base import CommandParser
+from django.conf import settings
+from django.core.management.base import CommandError, CommandParser
 from django.core.management.commands.migrate import Command as BaseCommand
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
 
-from locked_migrations.backends import AbstractBaseLock, get_backend
+from locked_migrations.backends import get_lock
 
 logger = logging.getLogger(__name__)
 
-
-class GetBackend(argparse.Action):
-    """Custom action to get the lock backend class from its name."""
-
-    def __call__(
-        self,
-        parser: argparse.ArgumentParser,
-        namespace: argparse.Namespace,
-        values: str | Sequence[Any] | None,
-        option_string: str | None = None,
-    ) -> None:
-        """Set the backend class on the namespace."""
-        setattr(namespace, self.dest, get_backend(str(values)))
+DEFAULT_LOCK_BACKEND = 'file'
+LOCK_BACKENDS = ('file', 'native', 'pg', 'row')
+DEFAULT_LOCK_TIMEOUT = 60
 
 
 class Command(BaseCommand):
@@ -38,31 +30,57 @@ class Command(BaseCommand):
 
         parser.add_argument(
             '--lock-backend',
-            action=GetBackend,
-            default=get_backend('file'),
-            help='The locking backend to use during migrations',
+            choices=LOCK_BACKENDS,
+            default=DEFAULT_LOCK_BACKEND,
+            help='The locking backend to use during migrations: `file` (default), `native`, `pg`, or `row`',
             type=str,
         )
 
         parser.add_argument(
             '--lock-timeout',
-            default=60,
+            default=DEFAULT_LOCK_TIMEOUT,
             help='The number of seconds to wait for acquiring the lock before timing out; default is 60 seconds',
             type=int,
         )
 
     def handle(self, *args: Any, **options: Any) -> Any:
-        """Execute the base method within a lock."""
-        Lock: type[AbstractBaseLock] = options.pop('lock_backend')  # noqa: N806  # it's a class — should be capitalized
-        timeout = options.pop('lock_timeout')
+        """Execute the base method within a lock (unless there are no migrations to apply)."""
+        # the defaults apply when `handle()` is called directly, bypassing the argument parser
+        backend = options.pop('lock_backend', DEFAULT_LOCK_BACKEND)
+        timeout = options.pop('lock_timeout', DEFAULT_LOCK_TIMEOUT)
 
-        lock = Lock()
-        lock.acquire(timeout=timeout)
+        if not self._has_pending_migrations(options):
+            return super().handle(*args, **options)
+
+        lock = get_lock(backend)
+        if not lock.acquire(timeout=timeout):
+            raise CommandError(f'Could not acquire the migration lock within {timeout} seconds')
+
+        # another process may have applied the migrations while this one was waiting for the lock
+        if not self._has_pending_migrations(options):
+            lock.release()
+            return super().handle(*args, **options)
+
+        # optionally hold the lock for at least `LOCKED_MIGRATIONS_MIN_HOLD` seconds after applying migrations, which
+        # spaces out bursts of deployments (waiters with nothing to apply release the lock without holding it)
+        release_after = time.monotonic() + getattr(settings, 'LOCKED_MIGRATIONS_MIN_HOLD', 0)
 
         try:
             return super().handle(*args, **options)
         finally:
+            if (remaining := release_after - time.monotonic()) > 0:
+                time.sleep(remaining)
             lock.release()
 
+    @staticmethod
+    def _has_pending_migrations(options: dict[str, Any]) -> bool:
+        """Return `False` if migrating every app forward would not apply any migrations.
+
+        Invocations that target an app (which can also unapply migrations) or create tables without migrations are
+        assumed to have work to do, so they are always executed within the lock.
+        """
+        if options['app_label'] or options['run_syncdb']:
+            return True
 
-logger.debug('successfully imported %s', __name__)
+        executor = MigrationExecutor(connections[options['database']])
+        return bool(executor.migration_plan(executor.loader.graph.leaf_nodes()))
@@ -0,0 +1,33 @@
+"""Create the `MigrationLock` table and its sentinel row."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.db import migrations, models
+
+SENTINEL_PK = 1  # duplicated from `locked_migrations.models` so that this migration does not depend on the current code
+
+
+def create_sentinel(apps: Any, schema_editor: Any) -> None:
+    """Insert the row that is locked by `locked_migrations.backends.row.RowLock`."""
+    MigrationLock = apps.get_model('locked_migrations', 'MigrationLock')
+    MigrationLock.objects.using(schema_editor.connection.alias).get_or_create(pk=SENTINEL_PK)
+
+
+class Migration(migrations.Migration):
+    """Create the `MigrationLock` table and its sentinel row."""
+
+    initial = True
+
+    dependencies = []  # noqa: RUF012  # overrides `Migration.dependencies`
+
+    operations = [  # noqa: RUF012  # overrides `Migration.operations`
+        migrations.CreateModel(
+            name='MigrationLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.RunPython(create_sentinel, migrations.RunPython.noop),
+    ]
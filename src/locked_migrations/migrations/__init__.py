@@ -0,0 +1 @@
+"""Define the migrations for the `locked_migrations` app."""
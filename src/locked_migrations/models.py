@@ -0,0 +1,14 @@
+"""Define the models for the `locked_migrations` app."""
+
+from django.db import models
+
+SENTINEL_PK = 1
+"""The primary key of the single `MigrationLock` row that is locked by `locked_migrations.backends.row.RowLock`."""
+
+
+class MigrationLock(models.Model):
+    """A singleton row that serializes migrations with a `SELECT ... FOR UPDATE` row lock."""
+
+    def __str__(self) -> str:
+        """Identify the sentinel row."""
+        return f'MigrationLock({self.pk})'
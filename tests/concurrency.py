@@ -2,34 +2,98 @@
 
 from __future__ import annotations
 
+import csv
 import logging
 import multiprocessing as mp
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
 
 import django
+from django.conf import settings
 from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
 
 logger = logging.getLogger(__name__)
 
+WORKER_COUNTS = (1, 2, 5, 10)
+"""The contention levels (number of concurrent `migrate` commands) to measure."""
 
-def migrate(i_runner: int) -> None:
-    """Invoke the `migrate` command."""
+
+def setup(database: str) -> None:
+    """Set up Django with the default database replaced by the given throwaway SQLite file.
+
+    The benchmark unapplies every app's migrations between levels, so it must never run against the configured database.
+    """
+    settings.DATABASES['default'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': database}
     django.setup()
 
+
+def migrate(i_runner: int) -> tuple[int, int, str]:
+    """Invoke the `migrate` command and return the runner's index, the elapsed time in nanoseconds, and its status.
+
+    The status is `ok`, or the name of the exception class if the command failed (e.g. `CommandError` when the lock
+    could not be acquired in time), so that failed runs are not mistaken for fast ones.
+    """
     logger.info('Runner %d is executing the migrate command', i_runner)
 
+    status = 'ok'
+    t0 = time.perf_counter_ns()
     try:
-        call_command('migrate')
-    except Exception:
+        call_command('migrate', verbosity=0)
+    except Exception as exc:
         logger.exception('Runner %d failed', i_runner)
+        status = type(exc).__name__
+    t1 = time.perf_counter_ns()
+
+    return i_runner, t1 - t0, status
+
+
+def reset() -> None:
+    """Unapply the migrations of every app except `locked_migrations`, so that the next level contends for the lock.
+
+    Otherwise only the first level would apply any migrations; later levels would take the fast path and never acquire
+    the lock. The `locked_migrations` table is kept (the `row` backend locks one of its rows).
+    """
+    call_command('migrate', 'locked_migrations', verbosity=0)
+
+    loader = MigrationLoader(connection)
+    for app_label in sorted(loader.migrated_apps - {'locked_migrations'}):
+        call_command('migrate', app_label, 'zero', verbosity=0)
+
+    connection.close()
 
 
 def main() -> None:
-    """Spawn a pool of 10 subprocesses that each executes `django-admin migrate`."""
-    with mp.Pool(processes=10) as pool:
-        pool.map(migrate, range(10))
+    """Execute `django-admin migrate` concurrently at each contention level, writing the timings to stdout as CSV.
+
+    The `spawn` start method gives each worker a clean interpreter, so no database connections or lock state are
+    inherited from the parent process, which resets the database before each level. All processes share a temporary
+    SQLite database, which is deleted afterwards.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        database = str(Path(tmp) / 'db.sqlite3')
+        setup(database)
+
+        writer = csv.writer(sys.stdout)
+        writer.writerow(('workers', 'runner', 'elapsed_ns', 'status'))
+
+        ctx = mp.get_context('spawn')
+        for n_workers in WORKER_COUNTS:
+            reset()
+
+            # set up Django once in each worker process, rather than once per task
+            with ProcessPoolExecutor(
+                max_workers=n_workers, mp_context=ctx, initializer=setup, initargs=(database,)
+            ) as executor:
+                futures = [executor.submit(migrate, i_runner) for i_runner in range(n_workers)]
+                for future in as_completed(futures):
+                    writer.writerow((n_workers, *future.result()))
 
 
 if __name__ == '__main__':
+    mp.freeze_support()
     main()
-else:
-    logger.debug('successfully imported %s', __name__)
@@ -0,0 +1,84 @@
+"""Define fixtures shared by the test suite."""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from multiprocessing.synchronize import Event
+from pathlib import Path
+
+import django
+import pytest
+from django.db import connection
+from django.test import override_settings
+
+from locked_migrations.backends import get_backend
+
+HOLD_TIMEOUT = 10
+"""The maximum number of seconds to wait for the holder process to acquire (or release) the lock."""
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _django_setup() -> None:
+    """Configure Django for the test session."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'development_server.settings')
+    django.setup()
+
+
+@pytest.fixture
+def lockfile(tmp_path: Path) -> Iterator[Path]:
+    """Point the file-based backends at a lockfile in a temporary directory."""
+    path = tmp_path / 'migrations.lock'
+    with override_settings(LOCKED_MIGRATIONS_LOCKFILE=str(path)):
+        yield path
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> Iterator[Path]:
+    """Point the default database at an empty SQLite file in a temporary directory (rather than the development one)."""
+    path = tmp_path / 'db.sqlite3'
+    original = connection.settings_dict['NAME']
+
+    connection.close()
+    connection.settings_dict['NAME'] = str(path)
+    try:
+        yield path
+    finally:
+        connection.close()
+        connection.settings_dict['NAME'] = original
+
+
+def _hold(backend: str, held: Event, release: Event) -> None:
+    """Acquire the lock in a separate process until `release` is set."""
+    lock = get_backend(backend)()
+    lock.acquire()
+    held.set()
+    release.wait(HOLD_TIMEOUT)
+    lock.release()
+
+
+@pytest.fixture
+def holder(lockfile: Path) -> Callable[[str], AbstractContextManager[Event]]:
+    """Return a context manager that holds the given backend's lock in another process.
+
+    The yielded event releases the lock when it is set; the `fork` start method passes the overridden settings on to
+    the holder process.
+    """
+
+    @contextmanager
+    def hold(backend: str) -> Iterator[Event]:
+        ctx = mp.get_context('fork')
+        held, release = ctx.Event(), ctx.Event()
+        process = ctx.Process(target=_hold, args=(backend, held, release))
+        process.start()
+
+        try:
+            assert held.wait(HOLD_TIMEOUT), 'the holder process did not acquire the lock'
+            yield release
+        finally:
+            release.set()
+            process.join(HOLD_TIMEOUT)
+
+    return hold
@@ -0,0 +1,221 @@
+"""Exercise the file-based lock backends across processes."""
+
+from __future__ import annotations
+
+import errno
+import os
+import signal
+import threading
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from importlib.util import find_spec
+from multiprocessing.synchronize import Event
+from pathlib import Path
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+
+from locked_migrations.backends import file as file_backend
+from locked_migrations.backends import get_backend, get_lock
+from locked_migrations.backends.file import WATCH_TIMEOUT, FileLock, _probe
+from tests.fixtures import HOLD_TIMEOUT
+
+Holder = Callable[[str], AbstractContextManager[Event]]
+
+BACKENDS = ('file', 'native')
+
+requires_inotify = pytest.mark.skipif(find_spec('inotify_simple') is None, reason='requires `inotify_simple`')
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_non_blocking_acquire_fails_while_held(backend: str, holder: Holder) -> None:
+    """A non-blocking attempt returns `False` immediately while another process holds the lock."""
+    lock = get_backend(backend)()
+
+    with holder(backend):
+        assert not lock.acquire(blocking=False)
+        assert not lock.locked()
+
+    assert lock.acquire(blocking=False)
+    lock.release()
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_acquire_times_out_while_held(backend: str, holder: Holder) -> None:
+    """A bounded wait returns `False` once the timeout expires."""
+    lock = get_backend(backend)()
+
+    with holder(backend):
+        start = time.monotonic()
+        assert not lock.acquire(timeout=0.2)
+        elapsed = time.monotonic() - start
+
+    assert 0.2 <= elapsed < 0.2 + WATCH_TIMEOUT
+    assert not lock.locked()
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_blocking_acquire_wakes_on_release(backend: str, holder: Holder) -> None:
+    """A blocked waiter acquires the lock promptly once the other process releases it."""
+    lock = get_backend(backend)()
+
+    with holder(backend) as release:
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+
+        start = time.monotonic()
+        assert lock.acquire()
+        elapsed = time.monotonic() - start
+
+    # missing the `inotify` event would leave the waiter asleep for the `WATCH_TIMEOUT` safety net
+    assert elapsed < WATCH_TIMEOUT
+    lock.release()
+
+
+@pytest.mark.parametrize(('backend', 'mode'), [('file', 'hard'), ('file', 'soft'), ('native', 'hard')])
+def test_acquire_creates_missing_directory(backend: str, mode: str, tmp_path: Path) -> None:
+    """A waiting acquire creates the lockfile's parent directory (as `filelock` does) instead of failing."""
+    path = tmp_path / 'missing' / 'migrations.lock'
+
+    with override_settings(LOCKED_MIGRATIONS_LOCKFILE=str(path), LOCKED_MIGRATIONS_FILELOCK_MODE=mode):
+        lock = get_backend(backend)()
+        assert lock.acquire(timeout=1)
+        lock.release()
+
+
+@requires_inotify
+def test_watched_wait_ignores_other_files(holder: Holder, lockfile: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Writes to other files in the lockfile's directory do not wake the waiter to probe the lockfile again."""
+    probes: list[Path] = []
+
+    def probe(path: Path) -> bool:
+        probes.append(path)
+        return _probe(path)
+
+    monkeypatch.setattr(file_backend, '_probe', probe)
+    sibling, stop = lockfile.with_name('db.sqlite3-journal'), threading.Event()
+
+    def write_sibling() -> None:
+        while not stop.is_set():
+            sibling.write_bytes(b'journal')
+            time.sleep(0.002)
+
+    with holder('file'):
+        writer = threading.Thread(target=write_sibling)
+        writer.start()
+        try:
+            assert not FileLock().acquire(timeout=0.5)
+        finally:
+            stop.set()
+            writer.join()
+
+    # the waiter's own failed attempt closes the lockfile after opening it for writing, which wakes it once
+    assert len(probes) <= 2
+
+
+@requires_inotify
+def test_watched_wait_falls_back_to_polling(holder: Holder, monkeypatch: pytest.MonkeyPatch) -> None:
+    """If no `inotify` instance can be created (e.g. `EMFILE`), the wait polls instead of raising."""
+
+    def unavailable() -> None:
+        raise OSError(errno.EMFILE, os.strerror(errno.EMFILE))
+
+    monkeypatch.setattr('inotify_simple.INotify', unavailable)
+    lock = FileLock()
+
+    with holder('file') as release:
+        assert not lock.acquire(timeout=0.1)
+        threading.Timer(0.1, release.set).start()
+        assert lock.acquire(timeout=HOLD_TIMEOUT)
+
+    lock.release()
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_lock_is_reentrant(backend: str, lockfile: Path) -> None:
+    """Nested acquires on the same instance succeed; the lock is unlocked by the matching number of releases."""
+    lock = get_backend(backend)()
+    other = get_backend(backend)()
+
+    with lock:
+        assert lock.acquire(blocking=False)
+        lock.release()
+        assert lock.locked()
+        assert not other.acquire(blocking=False)
+
+    assert not lock.locked()
+    with pytest.raises(RuntimeError):
+        lock.release()
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_get_lock_reuses_the_held_instance(backend: str, lockfile: Path) -> None:
+    """Nested `migrate` commands in one thread share the held lock; other threads get their own instance."""
+    lock = get_lock(backend)
+
+    with lock:
+        assert get_lock(backend) is lock
+
+        others: list[object] = []
+        thread = threading.Thread(target=lambda: others.append(get_lock(backend)))
+        thread.start()
+        thread.join()
+        assert others[0] is not lock
+
+    assert get_lock(backend) is not lock
+
+
+@override_settings(LOCKED_MIGRATIONS_FILELOCK_MODE='Soft')
+def test_file_lock_rejects_unknown_mode(lockfile: Path) -> None:
+    """A `LOCKED_MIGRATIONS_FILELOCK_MODE` other than `hard` or `soft` is a configuration error, not a hard lock."""
+    with pytest.raises(ImproperlyConfigured, match='Soft'):
+        FileLock()
+
+
+def test_native_alarm_restores_previous_handler(holder: Holder) -> None:
+    """A timed wait in the main thread disarms its timer and restores the previous `SIGALRM` handler."""
+    lock = get_backend('native')()
+
+    def handler(signum: int, frame: object) -> None:  # pragma: no cover  # never called
+        """Stand in for an application's handler."""
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    try:
+        with holder('native'):
+            assert not lock.acquire(timeout=0.1)
+
+        assert signal.getsignal(signal.SIGALRM) is handler
+        assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+    finally:
+        signal.signal(signal.SIGALRM, previous)
+
+
+def test_probe_reports_held_lockfile(holder: Holder, lockfile: Path) -> None:
+    """The read-only probe detects another process's `flock()` without taking the lock."""
+    assert _probe(lockfile)
+
+    with holder('file'):
+        assert not _probe(lockfile)
+
+    assert _probe(lockfile)
+
+
+def test_forked_child_does_not_inherit_or_release_the_lock(lockfile: Path) -> None:
+    """A child forked while the lock is held contends for it instead of inheriting (or releasing) it."""
+    lock = get_backend('file')()
+    assert lock.acquire()
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover  # the child's coverage is not collected
+        inherited = lock.locked()
+        acquired = lock.acquire(blocking=False)
+        del lock
+        os._exit(0 if not inherited and not acquired else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    assert not get_backend('file')().acquire(blocking=False), "the child released the parent's lock"
+    lock.release()
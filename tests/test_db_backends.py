@@ -0,0 +1,174 @@
+"""Exercise the database lock backends without a database server."""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import pytest
+from django.db import DatabaseError, NotSupportedError, OperationalError, ProgrammingError
+
+from locked_migrations.backends import get_backend, pg
+from locked_migrations.backends.pg import PgAdvisoryLock, _split64, lock_key, lock_not_available, lock_timeout_sql
+from locked_migrations.backends.row import MYSQL_MAX_LOCK_WAIT_TIMEOUT, RowLock
+
+
+def database_error(error: type[DatabaseError] = OperationalError, *args: object, **attrs: object) -> DatabaseError:
+    """Build a Django database error wrapping a driver exception with the given `args` and attributes."""
+    cause = Exception(*args)
+    for name, value in attrs.items():
+        setattr(cause, name, value)
+
+    wrapped = error(*args)
+    wrapped.__cause__ = cause
+    return wrapped
+
+
+@pytest.fixture
+def pg_cursor(monkeypatch: pytest.MonkeyPatch) -> mock.MagicMock:
+    """Replace the default connection seen by the advisory lock backend with a PostgreSQL stand-in."""
+    connection = mock.MagicMock(vendor='postgresql')
+    monkeypatch.setattr(pg, 'connection', connection)
+    monkeypatch.setattr('django.db.transaction.atomic', mock.MagicMock())
+
+    cursor: mock.MagicMock = connection.cursor.return_value.__enter__.return_value
+    cursor.fetchone.return_value = (True,)
+    return cursor
+
+
+@pytest.fixture
+def row_connection(monkeypatch: pytest.MonkeyPatch) -> mock.MagicMock:
+    """Replace the dedicated connection opened by the row lock backend with a stand-in."""
+    connection = mock.MagicMock(vendor='postgresql')
+    connection.ops.quote_name.side_effect = lambda name: f'"{name}"'
+    connection.ops.for_update_sql.side_effect = lambda nowait: 'FOR UPDATE NOWAIT' if nowait else 'FOR UPDATE'
+    connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (1,)
+    monkeypatch.setattr('django.db.connections.create_connection', lambda alias: connection)
+    return connection
+
+
+def test_split64() -> None:
+    """A 64-bit key is split into the signed high and low `int4` halves."""
+    assert _split64(0) == (0, 0)
+    assert _split64(0x7FFFFFFF_00000001) == (0x7FFFFFFF, 1)
+    assert _split64(0xFFFFFFFF_80000000) == (-1, -(1 << 31))
+
+
+@pytest.mark.parametrize(
+    ('error', 'expected'),
+    [
+        (database_error(sqlstate='55P03'), True),
+        (database_error(pgcode='55P03'), True),
+        (database_error(sqlstate='57014'), False),
+        (OperationalError('no driver exception'), False),
+    ],
+)
+def test_lock_not_available(error: DatabaseError, expected: bool) -> None:
+    """Only SQLSTATE `55P03` (from `psycopg` 3 or `psycopg2`) means that the lock could not be acquired."""
+    assert lock_not_available(error) is expected
+
+
+@pytest.mark.parametrize(
+    ('timeout', 'expected'),
+    [
+        (0.0001, "SET LOCAL lock_timeout = '1ms'"),
+        (0.0015, "SET LOCAL lock_timeout = '2ms'"),
+        (60, "SET LOCAL lock_timeout = '60000ms'"),
+        (-1, 'SET LOCAL lock_timeout = 0'),
+    ],
+)
+def test_lock_timeout_sql(timeout: float, expected: str) -> None:
+    """Timeouts round up to at least 1 ms (`'0ms'` would disable the timeout); a negative value disables it."""
+    assert lock_timeout_sql(timeout) == expected
+
+
+def test_pg_backend_requires_postgresql() -> None:
+    """The advisory lock backend refuses other databases up front rather than failing on PostgreSQL-only SQL."""
+    with pytest.raises(NotSupportedError, match='advisory locks'):
+        get_backend('pg')()
+
+
+@pytest.mark.parametrize(('timeout', 'expected'), [(-1, 'SET LOCAL lock_timeout = 0'), (2, lock_timeout_sql(2))])
+def test_pg_waits_override_the_server_lock_timeout(pg_cursor: mock.MagicMock, timeout: float, expected: str) -> None:
+    """Every waiting acquire sets `lock_timeout`, so an unbounded wait is not cut short by the server's setting."""
+    lock = PgAdvisoryLock()
+    assert lock.acquire(timeout=timeout)
+
+    assert pg_cursor.execute.call_args_list == [
+        mock.call(expected),
+        mock.call('SELECT pg_advisory_lock(%s, %s)', lock_key()),
+    ]
+    lock.release()
+
+
+def test_row_backend_requires_select_for_update() -> None:
+    """The row lock backend refuses databases without `SELECT ... FOR UPDATE` (e.g. SQLite)."""
+    with pytest.raises(NotSupportedError, match='FOR UPDATE'):
+        get_backend('row')()
+
+
+@pytest.mark.parametrize(
+    ('vendor', 'timeout', 'expected'),
+    [
+        ('postgresql', 0.0001, "SET LOCAL lock_timeout = '1ms'"),
+        ('postgresql', -1, 'SET LOCAL lock_timeout = 0'),
+        ('mysql', 0.2, 'SET SESSION innodb_lock_wait_timeout = 1'),
+        ('mysql', -1, f'SET SESSION innodb_lock_wait_timeout = {MYSQL_MAX_LOCK_WAIT_TIMEOUT}'),
+    ],
+)
+def test_row_waits_set_the_lock_timeout(
+    row_connection: mock.MagicMock, vendor: str, timeout: float, expected: str
+) -> None:
+    """Waiting acquires always set the lock timeout, so a negative timeout overrides the server's default."""
+    row_connection.vendor = vendor
+    lock = RowLock()
+    assert lock.acquire(timeout=timeout)
+
+    cursor = row_connection.cursor.return_value.__enter__.return_value
+    assert cursor.execute.call_args_list == [
+        mock.call(expected),
+        mock.call('SELECT id FROM "locked_migrations_migrationlock" WHERE id = %s FOR UPDATE', [1]),
+    ]
+
+    lock.release()
+    row_connection.close.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ('vendor', 'error'),
+    [
+        ('postgresql', database_error(sqlstate='55P03')),
+        ('mysql', database_error(OperationalError, 1205, 'Lock wait timeout exceeded')),
+        ('mysql', database_error(DatabaseError, 3572, 'Statement aborted because lock(s) could not be acquired')),
+    ],
+)
+def test_row_lock_not_available(row_connection: mock.MagicMock, vendor: str, error: DatabaseError) -> None:
+    """A lock conflict or an expired wait returns `False` and closes the dedicated connection."""
+    row_connection.vendor = vendor
+    cursor = row_connection.cursor.return_value.__enter__.return_value
+    cursor.execute.side_effect = error
+
+    lock = RowLock()
+    assert not lock.acquire(blocking=False)
+    assert not lock.locked()
+    row_connection.close.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    ('vendor', 'error'),
+    [
+        ('postgresql', database_error(ProgrammingError, sqlstate='42P01')),
+        ('postgresql', database_error(sqlstate='57P01')),
+        ('mysql', database_error(OperationalError, 2013, 'Lost connection to server during query')),
+    ],
+)
+def test_row_other_errors_close_the_connection(
+    row_connection: mock.MagicMock, vendor: str, error: DatabaseError
+) -> None:
+    """Any other error (e.g. a missing table or a lost connection) is raised after closing the dedicated connection."""
+    row_connection.vendor = vendor
+    row_connection.cursor.return_value.__enter__.return_value.execute.side_effect = error
+
+    with pytest.raises(type(error)):
+        RowLock().acquire(blocking=False)
+
+    row_connection.close.assert_called_once()
@@ -0,0 +1,91 @@
+"""Exercise the `migrate` command that runs within the lock."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from multiprocessing.synchronize import Event
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.migrations.recorder import MigrationRecorder
+from django.test import override_settings
+
+from locked_migrations.backends import get_lock
+from locked_migrations.management.commands import migrate
+from locked_migrations.management.commands.migrate import DEFAULT_LOCK_BACKEND, DEFAULT_LOCK_TIMEOUT, Command
+
+Holder = Callable[[str], AbstractContextManager[Event]]
+
+
+def test_failed_acquire_raises_command_error(database: Path, holder: Holder) -> None:
+    """Migrations are not applied without the lock: a timed-out acquire aborts the command."""
+    with holder('file'), pytest.raises(CommandError, match='within 1 seconds'):
+        call_command('migrate', verbosity=0, lock_timeout=1)
+
+    assert not MigrationRecorder(connection).applied_migrations()
+
+
+def test_no_pending_migrations_skips_the_lock(database: Path, holder: Holder) -> None:
+    """When every migration is already applied, the command returns without waiting for the lock."""
+    call_command('migrate', verbosity=0)
+
+    with holder('file'):
+        start = time.monotonic()
+        call_command('migrate', verbosity=0, lock_timeout=1)
+
+    assert time.monotonic() - start < 1
+
+
+def test_handle_defaults_the_lock_options(database: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Calling `handle()` directly, without the parser's lock options, uses the default backend and timeout."""
+    lock = mock.Mock()
+    lock.acquire.return_value = True
+    get_lock_mock = mock.Mock(return_value=lock)
+    monkeypatch.setattr(migrate, 'get_lock', get_lock_mock)
+
+    command = Command()
+    options = vars(command.create_parser('manage.py', 'migrate').parse_args(['--verbosity=0']))
+    del options['lock_backend'], options['lock_timeout']
+    command.handle(**options)
+
+    get_lock_mock.assert_called_once_with(DEFAULT_LOCK_BACKEND)
+    lock.acquire.assert_called_once_with(timeout=DEFAULT_LOCK_TIMEOUT)
+    lock.release.assert_called_once_with()
+
+
+@override_settings(LOCKED_MIGRATIONS_MIN_HOLD=0.5)
+def test_min_hold_after_applying_migrations(database: Path, lockfile: Path) -> None:
+    """A process that applied migrations holds the lock for at least `LOCKED_MIGRATIONS_MIN_HOLD` seconds."""
+    start = time.monotonic()
+    call_command('migrate', verbosity=0)
+
+    assert time.monotonic() - start >= 0.5
+    assert not get_lock('file').locked()
+
+
+@override_settings(LOCKED_MIGRATIONS_MIN_HOLD=10)
+def test_waiter_with_nothing_to_apply_releases_without_holding(
+    database: Path, lockfile: Path, holder: Holder, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A waiter whose plan is empty once it acquires the lock releases it without holding it for the minimum time."""
+    with override_settings(LOCKED_MIGRATIONS_MIN_HOLD=0):
+        call_command('migrate', verbosity=0)
+
+    # the migrations are applied by the holder while this process waits for the lock
+    has_pending_migrations = mock.Mock(side_effect=[True, False])
+    monkeypatch.setattr(Command, '_has_pending_migrations', has_pending_migrations)
+
+    with holder('file') as release:
+        release.set()
+        start = time.monotonic()
+        call_command('migrate', verbosity=0)
+
+    assert time.monotonic() - start < 10
+    assert has_pending_migrations.call_count == 2
+    assert not get_lock('file').locked()